@@ -4,10 +4,46 @@ Uses machine learning to generate optimal locators
 """
 
 import re
-from typing import List, Dict
+from typing import Dict, Tuple
 from robot.api.deco import keyword, library
 from robot.api import logger
 
+# Precompiled patterns used by locator validation
+_INDEX_RE = re.compile(r'\[\d+\]')
+_CLASS_CONTAINS = 'contains(@class'
+
+
+def _build_smart_locators(element_info: Dict) -> Tuple[str, ...]:
+    """Build fallback locators for an element in order of reliability"""
+    locators = []
+    
+    # Priority 1: Unique identifiers
+    element_id = element_info.get('id')
+    if element_id:
+        locators.append(f"id={element_id}")
+    
+    if 'data-testid' in element_info:
+        locators.append(f"css=[data-testid='{element_info['data-testid']}']")
+    
+    # Priority 2: Name attribute
+    name = element_info.get('name')
+    if name:
+        locators.append(f"name={name}")
+    
+    # Priority 3: Composite selectors
+    if 'class' in element_info and 'type' in element_info:
+        locators.append(f"css={element_info.get('tag', 'button')}.{element_info['class']}[type='{element_info['type']}']")
+    
+    # Priority 4: Text-based
+    if 'text' in element_info:
+        locators.append(f"xpath=//*[contains(text(), '{element_info['text']}')]")
+    
+    # Priority 5: Aria labels
+    if 'aria-label' in element_info:
+        locators.append(f"css=[aria-label='{element_info['aria-label']}']")
+    
+    return tuple(locators)
+
 
 @library(scope='GLOBAL')
 class AILocatorLibrary:
@@ -16,45 +52,21 @@ class AILocatorLibrary:
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
     
     @keyword("Generate Smart Locator")
-    def generate_smart_locator(self, element_info: Dict) -> List[str]:
+    def generate_smart_locator(self, element_info: Dict) -> Tuple[str, ...]:
         """
         Generate multiple fallback locators for an element.
-        Returns list of locators in order of reliability.
+        Returns tuple of locators in order of reliability.
         
         Args:
             element_info: Dict with element attributes
             
         Returns:
-            List of locator strategies
+            Tuple of locator strategies
             
         Example:
             | ${locators}= | Generate Smart Locator | {'id': 'btn', 'class': 'submit'} |
         """
-        locators = []
-        
-        # Priority 1: Unique identifiers
-        if 'id' in element_info and element_info['id']:
-            locators.append(f"id={element_info['id']}")
-        
-        if 'data-testid' in element_info:
-            locators.append(f"css=[data-testid='{element_info['data-testid']}']")
-        
-        # Priority 2: Name attribute
-        if 'name' in element_info and element_info['name']:
-            locators.append(f"name={element_info['name']}")
-        
-        # Priority 3: Composite selectors
-        if 'class' in element_info and 'type' in element_info:
-            locators.append(f"css={element_info.get('tag', 'button')}.{element_info['class']}[type='{element_info['type']}']")
-        
-        # Priority 4: Text-based
-        if 'text' in element_info:
-            locators.append(f"xpath=//*[contains(text(), '{element_info['text']}')]")
-        
-        # Priority 5: Aria labels
-        if 'aria-label' in element_info:
-            locators.append(f"css=[aria-label='{element_info['aria-label']}']")
-        
+        locators = _build_smart_locators(element_info)
         logger.info(f"Generated {len(locators)} smart locators")
         return locators
     
@@ -84,13 +96,13 @@ class AILocatorLibrary:
             issues.append("Absolute XPath detected - very fragile")
             recommendations.append("Use relative XPath or CSS selectors")
         
-        if 'contains(@class' in locator:
+        if _CLASS_CONTAINS in locator:
             score -= 10
             issues.append("Class-based locator may be unstable")
             recommendations.append("Consider using data-testid or ID")
         
         # Check for index-based selectors
-        if re.search(r'\[\d+\]', locator):
+        if _INDEX_RE.search(locator):
             score -= 15
             issues.append("Index-based selector detected")
             recommendations.append("Use unique attributes instead")
@@ -5,12 +5,37 @@ Custom utility library with common helper functions
 import json
 import random
 import string
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from itertools import accumulate
+from typing import Dict, List, Any, Optional, Tuple
 from robot.api.deco import keyword, library
 from robot.api import logger
 from faker import Faker
 
+# Only the Faker providers this library actually uses
+_FAKER_PROVIDERS = [
+    'faker.providers.person',
+    'faker.providers.address',
+    'faker.providers.internet',
+    'faker.providers.phone_number',
+    'faker.providers.date_time',
+    'faker.providers.ssn',
+]
+
+# Character set used for generated passwords
+_PWD_CHARS = string.ascii_letters + string.digits + "!@#$%^&*()"
+
+# OS entropy source for passwords that must be cryptographically strong
+_SYSTEM_RANDOM = random.SystemRandom()
+
+
+def _word_pool(elements) -> Tuple[tuple, Optional[tuple]]:
+    """Split a Faker word list into values and cumulative weights (None when unweighted)"""
+    if isinstance(elements, dict):
+        return tuple(elements), tuple(accumulate(elements.values()))
+    return tuple(elements), None
+
 
 @library(scope='GLOBAL')
 class CustomLibrary:
@@ -18,9 +43,25 @@ class CustomLibrary:
     
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
     
-    def __init__(self):
-        self.faker = Faker()
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Args:
+            seed: Optional seed for reproducible test data across runs and workers
+        
+        Example:
+            | Library | CustomLibrary | seed=0 |
+        """
+        if seed is not None:
+            Faker.seed(int(seed))
+            random.seed(int(seed))
+        self.faker = Faker(locale='en_US', providers=_FAKER_PROVIDERS)
         self.test_data_cache = {}
+        # Word lists for fields that can skip Faker's provider dispatch
+        person = self.faker.provider('faker.providers.person')
+        address = self.faker.provider('faker.providers.address')
+        self._first_names, self._first_name_weights = _word_pool(person.first_names)
+        self._last_names, self._last_name_weights = _word_pool(person.last_names)
+        self._states, self._state_weights = _word_pool(address.states)
     
     @keyword("Generate Random Email")
     def generate_random_email(self, domain: str = "test.com") -> str:
@@ -33,35 +74,55 @@ class CustomLibrary:
     @keyword("Generate Random Phone")
     def generate_random_phone(self, country_code: str = "+1") -> str:
         """Generate random phone number"""
-        phone = f"{country_code}{random.randint(1000000000, 9999999999)}"
-        return phone
+        return f"{country_code}{random.randrange(10**9, 10**10)}"
     
-    @keyword("Generate Test User")
-    def generate_test_user(self) -> Dict:
-        """Generate complete test user with all details"""
-        user = {
-            'first_name': self.faker.first_name(),
-            'last_name': self.faker.last_name(),
+    def _build_user(self) -> Dict:
+        """Build one test user dict"""
+        return {
+            'first_name': random.choices(self._first_names, cum_weights=self._first_name_weights)[0],
+            'last_name': random.choices(self._last_names, cum_weights=self._last_name_weights)[0],
             'email': self.faker.email(),
             'phone': self.faker.phone_number(),
             'address': self.faker.address(),
             'city': self.faker.city(),
-            'state': self.faker.state(),
+            'state': random.choices(self._states, cum_weights=self._state_weights)[0],
             'zip': self.faker.zipcode(),
             'dob': self.faker.date_of_birth(minimum_age=18, maximum_age=80).strftime('%Y-%m-%d'),
             'ssn': self.faker.ssn(),
             'username': self.faker.user_name(),
             'password': self.generate_secure_password()
         }
+    
+    @keyword("Generate Test User")
+    def generate_test_user(self) -> Dict:
+        """Generate complete test user with all details"""
+        user = self._build_user()
         logger.info(f"Generated test user: {user['email']}")
         return user
     
+    @keyword("Generate Test Users")
+    def generate_test_users(self, n: int) -> List[Dict]:
+        """
+        Generate a batch of test users, logging once for the whole batch.
+        
+        Args:
+            n: Number of users to generate
+            
+        Returns:
+            List of user dicts with the same fields as Generate Test User
+            
+        Example:
+            | ${users}= | Generate Test Users | 100 |
+        """
+        users = [self._build_user() for _ in range(int(n))]
+        logger.info(f"Generated {len(users)} test users")
+        return users
+    
     @keyword("Generate Secure Password")
-    def generate_secure_password(self, length: int = 12) -> str:
-        """Generate secure random password"""
-        chars = string.ascii_letters + string.digits + "!@#$%^&*()"
-        password = ''.join(random.choice(chars) for _ in range(length))
-        return password
+    def generate_secure_password(self, length: int = 12, cryptographic: bool = False) -> str:
+        """Generate secure random password, drawing from OS entropy when cryptographic is set"""
+        rng = _SYSTEM_RANDOM if cryptographic else random
+        return ''.join(rng.choices(_PWD_CHARS, k=int(length)))
     
     @keyword("Get Current Timestamp")
     def get_current_timestamp(self, format: str = "%Y-%m-%d %H:%M:%S") -> str:
@@ -87,15 +148,17 @@ class CustomLibrary:
         Returns:
             True if condition met, False if timeout
         """
-        end_time = time.time() + timeout
+        _mono = time.monotonic
+        _sleep = time.sleep
+        deadline = _mono() + float(timeout)
         
-        while time.time() < end_time:
+        while _mono() < deadline:
             try:
                 if condition_func():
                     return True
             except:
                 pass
-            time.sleep(poll_interval)
+            _sleep(poll_interval)
         
         return False
     
@@ -4,18 +4,92 @@ Automatically heals broken locators using multiple fallback strategies
 """
 
 import os
+import re
+import atexit
 import json
 import time
+import sqlite3
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
+from lxml import etree, html as lxml_html
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.common.exceptions import NoSuchElementException
 from robot.api.deco import keyword, library
 from robot.api import logger
-import cv2
-import numpy as np
-from PIL import Image
-import io
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+# Minimum seconds between healing cache flushes to disk
+_CACHE_FLUSH_INTERVAL = 5.0
+
+# Default location of the healing cache shared by all workers
+_DEFAULT_CACHE_DB = 'reports/healing_cache.db'
+
+# Common button/link texts tried when healing by text content
+_TEXT_HINTS = ('Login', 'Submit', 'Search', 'Save', 'Cancel')
+
+# Text literals inside the original locator, e.g. contains(text(), 'Sign in')
+_TEXT_LITERAL_RE = re.compile(r"""text\(\)\s*[,=]\s*(['"])(.+?)\1""")
+
+
+def _xpath_literal(text: str) -> str:
+    """Quote a string for use as an XPath literal"""
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    parts = text.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+def _text_union_xpath(hints: Tuple[str, ...]) -> str:
+    """Build one XPath matching elements whose text contains any of the hints"""
+    return "//*[" + " or ".join(f"contains(text(), {_xpath_literal(hint)})" for hint in hints) + "]"
+
+
+@lru_cache(maxsize=256)
+def _compiled_xpath(xpath: str) -> etree.XPath:
+    """Compile an XPath expression once for local evaluation"""
+    return etree.XPath(xpath)
+
+
+# Lowercase locator strategy prefixes mapped to Selenium By values
+_BY_MAPPING = {
+    'id': By.ID,
+    'name': By.NAME,
+    'xpath': By.XPATH,
+    'css': By.CSS_SELECTOR,
+    'class': By.CLASS_NAME,
+    'tag': By.TAG_NAME,
+    'link': By.LINK_TEXT,
+    'partial_link': By.PARTIAL_LINK_TEXT
+}
+
+
+@lru_cache(maxsize=4096)
+def _parse_locator(locator: str) -> Tuple[str, str]:
+    """
+    Split a 'strategy=value' locator into a (By, value) pair.
+    Strategy prefixes are expected in lowercase; other casings are still
+    accepted through a slower fallback lookup.
+    """
+    strategy, sep, value = locator.partition('=')
+    if not sep:
+        return By.XPATH, locator
+    by = _BY_MAPPING.get(strategy)
+    if by is None:
+        by = _BY_MAPPING.get(strategy.lower(), By.XPATH)
+    return by, value
 
 
 @library(scope='GLOBAL', auto_keywords=True)
@@ -28,30 +102,153 @@ class SelfHealingLibrary:
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
     ROBOT_LIBRARY_VERSION = '1.0.0'
     
-    def __init__(self):
+    # Returns the first element carrying any common attribute, checked in priority order
+    _ATTRIBUTE_HEALING_SCRIPT = '''
+        const attributes = ['data-testid', 'data-test', 'name', 'type', 'role', 'aria-label'];
+        for (const attr of attributes) {
+            const element = document.querySelector('[' + attr + ']');
+            if (element) {
+                return element;
+            }
+        }
+        return null;
+    '''
+    
+    def __init__(self, cache_db: Optional[str] = None):
+        """
+        Args:
+            cache_db: Path of the healing cache database. Defaults to the
+                      ${HEALING_DB} variable, then reports/healing_cache.db
+        """
         self.healing_cache = {}
         self.healing_history = []
-        self.cache_file = 'reports/healing_cache.json'
+        self.cache_db = cache_db or self._get_cache_db_variable()
+        self.legacy_cache_file = 'reports/healing_cache.json'
+        self._retire_legacy = False
+        self._db = None
+        self._pending = {}
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._text_ac = self._build_text_automaton(_TEXT_HINTS)
         self.load_cache()
-        
+        atexit.register(self.save_cache)
+    
+    @staticmethod
+    def _get_cache_db_variable() -> str:
+        """Read the shared cache path passed to robot/pabot as ${HEALING_DB}"""
+        try:
+            return BuiltIn().get_variable_value('${HEALING_DB}', _DEFAULT_CACHE_DB)
+        except RobotNotRunningError:
+            return _DEFAULT_CACHE_DB
+    
+    def _open_cache_db(self) -> bool:
+        """Open (and create if needed) the SQLite store backing the healing cache"""
+        if self._db is not None:
+            return True
+        try:
+            cache_dir = os.path.dirname(self.cache_db)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            # Parallel workers share this database; WAL lets readers and a writer coexist
+            self._db = sqlite3.connect(self.cache_db, timeout=30)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS cache (k TEXT PRIMARY KEY, v TEXT)')
+            self._db.commit()
+            return True
+        except Exception as e:
+            self._db = None
+            logger.warn(f"Could not open healing cache database: {e}")
+            return False
+    
     def load_cache(self):
         """Load previously healed locators from cache"""
+        legacy = self._load_legacy_cache()
+        stored = {}
+        # Only open an existing database here; it is created on the first flush
+        if os.path.exists(self.cache_db) and self._open_cache_db():
+            try:
+                stored = dict(self._db.execute('SELECT k, v FROM cache'))
+            except Exception as e:
+                logger.warn(f"Could not load healing cache: {e}")
+        
+        # Migrate legacy entries the database doesn't know about yet
+        for original_locator, healed_locator in legacy.items():
+            if original_locator not in stored:
+                self._pending[original_locator] = healed_locator
+                self._dirty = True
+        
+        # The legacy file is retired once all of its entries are in the database
+        if legacy:
+            if self._dirty:
+                self._retire_legacy = True
+            else:
+                self._retire_legacy_cache()
+        
+        # Heals not flushed yet are newer than anything on disk
+        self.healing_cache = {**legacy, **stored, **self._pending}
+        if self.healing_cache:
+            logger.info(f"Loaded {len(self.healing_cache)} healed locators from cache")
+    
+    def _load_legacy_cache(self) -> Dict:
+        """Read healed locators from the JSON cache file used by earlier versions"""
         try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r') as f:
-                    self.healing_cache = json.load(f)
-                logger.info(f"Loaded {len(self.healing_cache)} healed locators from cache")
+            with open(self.legacy_cache_file, 'rb') as f:
+                legacy = _json.loads(f.read())
+        except FileNotFoundError:
+            return {}
         except Exception as e:
-            logger.warn(f"Could not load healing cache: {e}")
+            logger.warn(f"Could not load legacy healing cache: {e}")
+            return {}
+        if not isinstance(legacy, dict):
+            logger.warn(f"Ignoring legacy healing cache: expected an object, got {type(legacy).__name__}")
+            return {}
+        return legacy
+    
+    def _retire_legacy_cache(self):
+        """Rename the migrated legacy JSON cache so later runs don't parse it again"""
+        try:
+            os.replace(self.legacy_cache_file, f"{self.legacy_cache_file}.migrated")
+        except FileNotFoundError:
+            pass  # Already retired by another worker
+        except OSError as e:
+            logger.warn(f"Could not retire legacy healing cache: {e}")
+        self._retire_legacy = False
     
     def save_cache(self):
-        """Save healed locators to cache"""
+        """Flush pending healed locators to cache"""
+        if not self._dirty or not self._open_cache_db():
+            return
         try:
-            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.healing_cache, f, indent=2)
+            self._db.executemany('INSERT OR REPLACE INTO cache VALUES (?, ?)', self._pending.items())
+            self._db.commit()
+            self._pending.clear()
+            self._dirty = False
+            if self._retire_legacy:
+                self._retire_legacy_cache()
         except Exception as e:
             logger.warn(f"Could not save healing cache: {e}")
+        self._last_flush = time.monotonic()
+    
+    def _lookup_shared_cache(self, original_locator: str) -> Optional[str]:
+        """Read a healed locator straight from the database shared by all workers"""
+        if self._db is None and not os.path.exists(self.cache_db):
+            return None
+        if not self._open_cache_db():
+            return None
+        try:
+            row = self._db.execute('SELECT v FROM cache WHERE k = ?', (original_locator,)).fetchone()
+        except Exception as e:
+            logger.debug(f"Could not read healing cache: {e}")
+            return None
+        return row[0] if row else None
+    
+    def _save_cache_entry(self, original_locator: str, healed_locator: str):
+        """Queue a healed locator for persistence, flushing at most every few seconds"""
+        self._pending[original_locator] = healed_locator
+        self._dirty = True
+        if time.monotonic() - self._last_flush > _CACHE_FLUSH_INTERVAL:
+            self.save_cache()
     
     @keyword("Find Element With Healing")
     def find_element_with_healing(self, driver, locator: str, timeout: int = 10) -> WebElement:
@@ -94,6 +291,18 @@ class SelfHealingLibrary:
         except NoSuchElementException:
             logger.info(f"❌ Original locator failed: {locator}")
         
+        # Another worker may have healed this locator since the cache was loaded
+        shared_locator = self._lookup_shared_cache(locator)
+        if shared_locator and shared_locator != self.healing_cache.get(locator):
+            try:
+                element = self._find_element(driver, shared_locator)
+                if element:
+                    self.healing_cache[locator] = shared_locator
+                    logger.info(f"✅ Found element using locator healed by another worker: {shared_locator}")
+                    return element
+            except:
+                logger.info("Shared cached locator failed, trying other strategies")
+        
         # Strategy 2: Try alternative locator types
         logger.info("🔄 Attempting self-healing...")
         healed_element = self._try_healing_strategies(driver, locator)
@@ -102,7 +311,7 @@ class SelfHealingLibrary:
             # Cache the healed locator
             healed_locator = self._get_element_locator(healed_element)
             self.healing_cache[original_locator] = healed_locator
-            self.save_cache()
+            self._save_cache_entry(original_locator, healed_locator)
             
             # Log healing success
             healing_info = {
@@ -128,9 +337,17 @@ class SelfHealingLibrary:
             self._heal_by_visual_similarity
         ]
         
+        # Fetch the page once so strategies don't each pay for the round-trip
+        try:
+            page_source = driver.page_source
+        except Exception as e:
+            logger.debug(f"Could not fetch page source: {e}")
+            page_source = None
+        
+        # The WebDriver session is not thread-safe, so strategies run in order on this thread
         for strategy in strategies:
             try:
-                element = strategy(driver, original_locator)
+                element = strategy(driver, original_locator, page_source)
                 if element:
                     logger.info(f"✅ Healed using strategy: {strategy.__name__}")
                     return element
@@ -140,82 +357,97 @@ class SelfHealingLibrary:
         
         return None
     
-    def _heal_by_text_content(self, driver, locator: str) -> Optional[WebElement]:
+    @staticmethod
+    def _build_text_automaton(hints):
+        """Build an Aho-Corasick automaton over the text hints, if available"""
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for hint in hints:
+            automaton.add_word(hint, hint)
+        automaton.make_automaton()
+        return automaton
+    
+    def _heal_by_text_content(self, driver, locator: str, page_source: Optional[str] = None) -> Optional[WebElement]:
         """Find element by its text content"""
         try:
-            # Extract text from original locator if possible
-            text_hints = ['Login', 'Submit', 'Search', 'Save', 'Cancel']  # Common texts
+            # Texts from the original locator take priority over common texts
+            locator_hints = tuple(m.group(2) for m in _TEXT_LITERAL_RE.finditer(locator))
             
-            for text in text_hints:
-                try:
-                    element = driver.find_element(By.XPATH, f"//*[contains(text(), '{text}')]")
-                    return element
-                except:
-                    continue
+            # Scan the page source once and keep only the common hints that occur in it.
+            # Locator texts are not prefiltered: the serialized source escapes characters
+            # like '&', so only the local XPath evaluation can tell whether they match.
+            html = page_source if page_source is not None else driver.page_source
+            if self._text_ac is not None:
+                found = {hint for _, hint in self._text_ac.iter(html)}
+                common_hints = tuple(t for t in _TEXT_HINTS if t in found)
+            else:
+                common_hints = tuple(t for t in _TEXT_HINTS if t in html)
+            
+            xpaths = [_text_union_xpath(hints) for hints in (locator_hints, common_hints) if hints]
+            if not xpaths:
+                return None
+            
+            # Each hint group is a single XPath union, resolved against a local parse
+            tree = lxml_html.fromstring(html)
+            for xpath in xpaths:
+                nodes = _compiled_xpath(xpath)(tree)
+                if nodes:
+                    return self._find_element(driver, self._node_locator(nodes[0]) or f"xpath={xpath}")
         except Exception as e:
             logger.debug(f"Text content healing failed: {e}")
         return None
     
-    def _heal_by_nearby_elements(self, driver, locator: str) -> Optional[WebElement]:
+    @staticmethod
+    def _node_locator(node) -> Optional[str]:
+        """Build a stable Selenium locator for a locally parsed node, if it has one"""
+        node_id = node.get('id')
+        if node_id:
+            return f"id={node_id}"
+        node_name = node.get('name')
+        if node_name:
+            return f"name={node_name}"
+        return None
+    
+    def _heal_by_nearby_elements(self, driver, locator: str, page_source: Optional[str] = None) -> Optional[WebElement]:
         """Find element by analyzing nearby stable elements"""
         # This is a simplified version - in production, you'd analyze DOM structure
         return None
     
-    def _heal_by_attributes(self, driver, locator: str) -> Optional[WebElement]:
+    def _heal_by_attributes(self, driver, locator: str, page_source: Optional[str] = None) -> Optional[WebElement]:
         """Find element by common attributes (class, name, type, etc.)"""
         try:
-            # Try common attribute patterns
-            attributes = ['data-testid', 'data-test', 'name', 'type', 'role', 'aria-label']
-            
-            for attr in attributes:
-                try:
-                    elements = driver.find_elements(By.CSS_SELECTOR, f'[{attr}]')
-                    if elements:
-                        return elements[0]  # Return first match
-                except:
-                    continue
+            # Try common attribute patterns in a single round-trip
+            return driver.execute_script(self._ATTRIBUTE_HEALING_SCRIPT)
         except Exception as e:
             logger.debug(f"Attribute healing failed: {e}")
         return None
     
-    def _heal_by_position(self, driver, locator: str) -> Optional[WebElement]:
+    def _heal_by_position(self, driver, locator: str, page_source: Optional[str] = None) -> Optional[WebElement]:
         """Find element by its relative position on page"""
         # Simplified version - would use coordinate analysis in production
         return None
     
-    def _heal_by_visual_similarity(self, driver, locator: str) -> Optional[WebElement]:
+    def _heal_by_visual_similarity(self, driver, locator: str, page_source: Optional[str] = None) -> Optional[WebElement]:
         """Find element using visual/image recognition"""
-        # This would use OpenCV/TensorFlow for image matching
+        # This would use OpenCV/TensorFlow for image matching; import them here once implemented
         return None
     
     def _find_element(self, driver, locator: str) -> WebElement:
         """Parse locator string and find element"""
-        if '=' in locator:
-            strategy, value = locator.split('=', 1)
-            by_mapping = {
-                'id': By.ID,
-                'name': By.NAME,
-                'xpath': By.XPATH,
-                'css': By.CSS_SELECTOR,
-                'class': By.CLASS_NAME,
-                'tag': By.TAG_NAME,
-                'link': By.LINK_TEXT,
-                'partial_link': By.PARTIAL_LINK_TEXT
-            }
-            by = by_mapping.get(strategy.lower(), By.XPATH)
-            return driver.find_element(by, value)
-        else:
-            return driver.find_element(By.XPATH, locator)
+        by, value = _parse_locator(locator)
+        return driver.find_element(by, value)
     
     def _get_element_locator(self, element: WebElement) -> str:
         """Generate locator string for an element"""
-        # Try to generate a stable locator
-        if element.get_attribute('id'):
-            return f"id={element.get_attribute('id')}"
-        elif element.get_attribute('name'):
-            return f"name={element.get_attribute('name')}"
-        else:
-            return f"xpath=({element.tag_name})[1]"  # Simplified
+        # Try to generate a stable locator, reading each attribute only once
+        element_id = element.get_attribute('id')
+        if element_id:
+            return f"id={element_id}"
+        element_name = element.get_attribute('name')
+        if element_name:
+            return f"name={element_name}"
+        return f"xpath=({element.tag_name})[1]"  # Simplified
     
     @keyword("Get Healing Statistics")
     def get_healing_statistics(self) -> Dict:
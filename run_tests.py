@@ -30,6 +30,9 @@ class TestRunner:
             cmd = ['pabot', '--processes', str(args.processes)]
             cmd.extend(['-d', self.output_dir])
         
+        # Shared self-healing cache, so every pabot worker reads and writes the same store
+        cmd.extend(['-v', f'HEALING_DB:{os.path.abspath(args.healing_db)}'])
+        
         # Test tags
         if args.tags:
             cmd.extend(['-i', args.tags])
@@ -64,6 +67,11 @@ class TestRunner:
         
         # Execute
         try:
+            # Nothing runs after robot unless a report is requested, so hand the process over
+            if not args.allure and os.name == 'posix':
+                sys.stdout.flush()
+                os.execvp(cmd[0], cmd)
+            
             result = subprocess.run(cmd, check=False)
             
             print(f"\n{'='*80}")
@@ -106,6 +114,7 @@ def main():
     parser.add_argument('-s', '--suite', help='Specific test suite to run')
     parser.add_argument('-L', '--loglevel', default='INFO', choices=['TRACE', 'DEBUG', 'INFO', 'WARN', 'ERROR'], help='Log level')
     parser.add_argument('--allure', action='store_true', help='Generate Allure report')
+    parser.add_argument('--healing-db', default='reports/healing_cache.db', help='Self-healing cache database shared by all workers')
     
     args = parser.parse_args()
     